@@ -0,0 +1,377 @@
+import contextlib
+import importlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from level_mapper import LevelMapper
+from zelda_rom import ZeldaRom
+import zelda_constants
+from zelda_constants import Direction
+
+# Runs the existing LevelMapper engine and a candidate (faster) engine side by
+# side on randomly generated level data and checks that they agree exactly on
+# which level each room belongs to, the special items found, stairway
+# numbering and the block warnings printed.  Any mismatch is shrunk down to a
+# minimal failing ROM before being reported.
+#
+# Usage:
+#   python engine_harness.py [--engine=module.Function] [--roms=N] [--seed=S]
+#
+# A candidate engine is any function that takes a ROM filename and returns an
+# EngineResult.  With no --engine, the reference engine is checked against
+# itself, which is still useful for its throughput numbers.
+
+NUM_ROOMS = 0x80
+
+# A room with solid walls on every side and nothing in it, used to replace
+# rooms while shrinking a failing case.
+BLANK_ROOM_DATA = [0x24, 0x24, 0x00, 0x00, 0x03, 0x00]
+
+# Only item codes with names can be placed, since LevelMapper looks up the
+# name of every item it finds.
+GENERATED_ITEM_TYPES = sorted(zelda_constants.ITEMS.keys())
+GENERATED_ROOM_TYPES = sorted(zelda_constants.ROOM_TYPES.keys())
+GENERATED_WALL_TYPES = [0, 0, 0, 1, 1, 2, 4, 5, 6, 7]
+
+# Each generated level gets its own band of columns in its group's 16x8 grid
+# (levels 1-6, then levels 7-9), walled off from the other levels' bands.
+# Otherwise the last level mapped in each group would take over every room
+# and room ownership would hardly be checked at all.
+GENERATED_LEVEL_COLUMNS = ((3, 3, 3, 3, 2, 2), (6, 5, 5))
+
+
+# Returns the level that owns each room in generated ROMs, indexed by room
+# number with rooms 1-6 first and then rooms 7-9.
+def _GetGeneratedRoomLevels() -> List[int]:
+  room_levels = []  # type: List[int]
+  for group_num, column_counts in enumerate(GENERATED_LEVEL_COLUMNS):
+    column_levels = [
+        6 * group_num + level_index
+        for level_index, column_count in enumerate(column_counts)
+        for _ in range(0, column_count)
+    ]
+    room_levels.extend(column_levels[room_num % 0x10] for room_num in range(0, NUM_ROOMS))
+  return room_levels
+
+
+GENERATED_ROOM_LEVELS = _GetGeneratedRoomLevels()
+
+
+class EngineResult(object):
+
+  def __init__(self) -> None:
+    # Indexed by room number, rooms 1-6 first and then rooms 7-9.
+    self.room_levels = []  # type: List[int]
+    # (stairway passage room, stairway passage #, stairway item) for each room
+    self.stairways = []  # type: List[Tuple[int, int, int]]
+    self.special_items = []  # type: List[List[int]]
+    self.warnings = []  # type: List[str]
+    self.error = ""
+
+  # Returns a description of each way this result differs from another one.
+  def GetDifferences(self, other: "EngineResult") -> List[str]:
+    differences = []  # type: List[str]
+    if self.error != other.error:
+      differences.append("error: %r vs. %r" % (self.error, other.error))
+    for room_index, (ours, theirs) in enumerate(zip(self.room_levels, other.room_levels)):
+      if ours != theirs:
+        differences.append("room %s level: %x vs. %x" % (_GetRoomName(room_index), ours, theirs))
+    for room_index, (ours, theirs) in enumerate(zip(self.stairways, other.stairways)):
+      if ours != theirs:
+        differences.append("room %s stairway: %s vs. %s" % (_GetRoomName(room_index), ours, theirs))
+    if len(self.room_levels) != len(other.room_levels):
+      differences.append("room count: %d vs. %d" % (len(self.room_levels), len(other.room_levels)))
+    if self.special_items != other.special_items:
+      differences.append("special items: %s vs. %s" % (self.special_items, other.special_items))
+    if self.warnings != other.warnings:
+      differences.append("warnings: %s vs. %s" % (self.warnings, other.warnings))
+    return differences
+
+
+Engine = Callable[[str], EngineResult]
+
+
+def _GetRoomName(room_index: int) -> str:
+  return "%s:%02X" % ("7-9" if room_index >= NUM_ROOMS else "1-6", room_index % NUM_ROOMS)
+
+
+# The reference engine: the existing recursive, object-based LevelMapper.
+def RunLevelMapper(rom_filename: str) -> EngineResult:
+  result = EngineResult()
+  output = io.StringIO()
+  try:
+    with contextlib.redirect_stdout(output):
+      level_mapper = LevelMapper(ZeldaRom(rom_filename))
+      level_mapper.MapLevels()
+  except Exception as exception:  # pylint: disable=broad-except
+    result.error = repr(exception)
+    return result
+  for room in level_mapper.rooms_1_6 + level_mapper.rooms_7_9:
+    result.room_levels.append(room.GetLevelNumber())
+    result.stairways.append((room.GetStairwayPassageRoom(), room.stairway_passage_num,
+                             room.GetStairwayItem()))
+  result.special_items = [list(items) for items in level_mapper.special_items]
+  result.warnings = [
+      line for line in output.getvalue().splitlines() if line.startswith("Warning:")
+  ]
+  return result
+
+
+def _GetRoomDataLocation(room_index: int, table_num: int) -> int:
+  location = ZeldaRom.LEVEL_1_6_DATA_LOCATION + 0x80 * table_num + room_index % NUM_ROOMS
+  if room_index >= NUM_ROOMS:
+    location += ZeldaRom.LEVEL_DATA_OFFSET
+  return ZeldaRom.NES_HEADER_OFFSET + location
+
+
+def _GetStairwayListLocation(level_num: int) -> int:
+  return (ZeldaRom.NES_HEADER_OFFSET + ZeldaRom.LEVEL_ONE_START_ROOM_LOCATION +
+          ZeldaRom.SPECIAL_LEVEL_DATA_OFFSET * level_num + ZeldaRom.START_ROOM_STAIRWAY_ROOM_OFSET)
+
+
+# Returns the room next to a room in a direction, or None if that's off the
+# edge of the grid.
+def _GetNeighboringRoomIndex(room_index: int, direction: int) -> Optional[int]:
+  room_num = room_index % NUM_ROOMS
+  if direction in (Direction.WEST, Direction.EAST):
+    if room_num // 0x10 != (room_num + direction) // 0x10:
+      return None
+  elif not 0x0 <= room_num + direction < NUM_ROOMS:
+    return None
+  return room_index + direction
+
+
+def _GetRoomData(rom_data: bytearray, room_index: int) -> List[int]:
+  return [rom_data[_GetRoomDataLocation(room_index, table_num)] for table_num in range(0, 6)]
+
+
+def _SetRoomData(rom_data: bytearray, room_index: int, room_data: List[int]) -> None:
+  for table_num in range(0, 6):
+    rom_data[_GetRoomDataLocation(room_index, table_num)] = room_data[table_num]
+
+
+# Generates a ROM image containing random (but mappable) data for all nine
+# levels.  Everything outside of the room tables and level data is zeroed.
+#
+# Each level's rooms, start room and stairways are all in its own band of
+# GENERATED_ROOM_LEVELS.  Stairway rooms are walled off from their
+# neighbors, since their first two bytes hold the stairway's exits rather
+# than walls.
+def GenerateRomData(rng: random.Random) -> bytearray:
+  rom_data = bytearray(ZeldaRom.NES_HEADER_OFFSET + ZeldaRom.LEVEL_ONE_START_ROOM_LOCATION +
+                       9 * ZeldaRom.SPECIAL_LEVEL_DATA_OFFSET)
+  walls = []  # type: List[Dict[int, int]]
+  for room_index in range(0, 2 * NUM_ROOMS):
+    room_walls = {}  # type: Dict[int, int]
+    for direction in (Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST):
+      neighbor_index = _GetNeighboringRoomIndex(room_index, direction)
+      if (neighbor_index is None or
+          GENERATED_ROOM_LEVELS[neighbor_index] != GENERATED_ROOM_LEVELS[room_index]):
+        room_walls[direction] = zelda_constants.SOLID_WALL_TYPE
+      else:
+        room_walls[direction] = rng.choice(GENERATED_WALL_TYPES)
+    walls.append(room_walls)
+
+  stairway_exits = {}  # type: Dict[int, Tuple[int, int]]
+  for level_num in range(0, 9):
+    level_rooms = [
+        room_index for room_index in range(0, 2 * NUM_ROOMS)
+        if GENERATED_ROOM_LEVELS[room_index] == level_num
+    ]
+    start_room_index, *stairway_room_indexes = rng.sample(level_rooms, rng.randrange(2, 6))
+    open_rooms = [
+        room_index for room_index in level_rooms if room_index not in stairway_room_indexes
+    ]
+    for stairway_room_index in stairway_room_indexes:
+      for direction in (Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST):
+        neighbor_index = _GetNeighboringRoomIndex(stairway_room_index, direction)
+        if neighbor_index is not None:
+          walls[neighbor_index][-1 * direction] = zelda_constants.SOLID_WALL_TYPE
+      # Either an item room (both exits the same) or a passage between two rooms.
+      left_exit = rng.choice(open_rooms) % NUM_ROOMS
+      right_exit = left_exit if rng.randrange(0, 2) else rng.choice(open_rooms) % NUM_ROOMS
+      stairway_exits[stairway_room_index] = (left_exit, right_exit)
+
+    rom_data[_GetStairwayListLocation(level_num) - ZeldaRom.START_ROOM_STAIRWAY_ROOM_OFSET] = (
+        start_room_index % NUM_ROOMS)
+    stairway_list = [room_index % NUM_ROOMS for room_index in stairway_room_indexes]
+    stairway_list.append(rng.choice(list(zelda_constants.ENTRANCE_DIRECTION_MAP.keys())))
+    stairway_list.extend([0xFF] * (10 - len(stairway_list)))
+    location = _GetStairwayListLocation(level_num)
+    rom_data[location:location + 10] = bytes(stairway_list)
+
+  for room_index in range(0, 2 * NUM_ROOMS):
+    room_walls = walls[room_index]
+    if room_index in stairway_exits:
+      left_exit, right_exit = stairway_exits[room_index]
+      wall_bytes = [(rng.randrange(0, 2) << 7) | left_exit, (rng.randrange(0, 2) << 7) | right_exit]
+    else:
+      wall_bytes = [(room_walls[Direction.NORTH] << 5) | (room_walls[Direction.SOUTH] << 2),
+                    (room_walls[Direction.WEST] << 5) | (room_walls[Direction.EAST] << 2)]
+    _SetRoomData(rom_data, room_index, wall_bytes + [
+        rng.randrange(0, 0x100),
+        (rng.randrange(0, 2) << 7) | rng.choice(GENERATED_ROOM_TYPES),
+        rng.choice(GENERATED_ITEM_TYPES),
+        rng.randrange(0, 0x100) & 0x05,
+    ])
+  return rom_data
+
+
+class DifferentialHarness(object):
+
+  def __init__(self, reference_engine: Engine, candidate_engine: Engine) -> None:
+    self.engines = [reference_engine, candidate_engine]
+    self.engine_times = [0.0, 0.0]
+    self.num_roms = 0
+    # How many levels own at least one room, summed over the timed ROMs, as a
+    # check that the generated levels are separate enough to test ownership.
+    self.num_room_owning_levels = 0
+    self.temp_dir = tempfile.TemporaryDirectory(prefix="engine_harness_")
+    self.rom_filename = os.path.join(self.temp_dir.name, "generated.nes")
+
+  # Deletes the temporary directory that generated ROMs are written to.
+  def Close(self) -> None:
+    self.temp_dir.cleanup()
+
+  # Runs an engine, turning any exception it raises into an error result so
+  # that it's reported as a mismatch rather than stopping the harness.
+  def _RunEngine(self, engine: Engine) -> EngineResult:
+    try:
+      return engine(self.rom_filename)
+    except Exception as exception:  # pylint: disable=broad-except
+      result = EngineResult()
+      result.error = repr(exception)
+      return result
+
+  # Runs both engines on a ROM image.
+  #
+  # Args:
+  #   rom_data: The ROM image to map (bytearray)
+  #   timed: Whether to count this run towards the throughput numbers (bool)
+  # Returns:
+  #   Each way the candidate engine's result differs from the reference's
+  def _GetDifferences(self, rom_data: bytearray, timed: bool = False) -> List[str]:
+    with open(self.rom_filename, "wb") as rom_file:
+      rom_file.write(rom_data)
+    results = []  # type: List[EngineResult]
+    for engine_num, engine in enumerate(self.engines):
+      start_time = time.perf_counter()
+      results.append(self._RunEngine(engine))
+      if timed:
+        self.engine_times[engine_num] += time.perf_counter() - start_time
+    if timed:
+      self.num_roms += 1
+      self.num_room_owning_levels += len(set(results[0].room_levels) - {0xFF})
+    return results[0].GetDifferences(results[1])
+
+  # Shrinks a failing ROM image by blanking out whole stairway lists and then
+  # rooms, one at a time, for as long as the engines still disagree.
+  #
+  # Returns:
+  #   The shrunk ROM image (bytearray)
+  def Shrink(self, rom_data: bytearray) -> bytearray:
+    rom_data = bytearray(rom_data)
+    made_progress = True
+    while made_progress:
+      made_progress = False
+      for level_num in range(0, 9):
+        location = _GetStairwayListLocation(level_num)
+        stairway_list = [byte for byte in rom_data[location:location + 10] if byte != 0xFF]
+        if len(stairway_list) <= 1:
+          continue
+        candidate = bytearray(rom_data)
+        candidate[location:location + 10] = bytes(stairway_list[-1:] + [0xFF] * 9)
+        if self._GetDifferences(candidate):
+          rom_data = candidate
+          made_progress = True
+      for room_index in range(0, 2 * NUM_ROOMS):
+        if _GetRoomData(rom_data, room_index) == BLANK_ROOM_DATA:
+          continue
+        candidate = bytearray(rom_data)
+        _SetRoomData(candidate, room_index, BLANK_ROOM_DATA)
+        if self._GetDifferences(candidate):
+          rom_data = candidate
+          made_progress = True
+    return rom_data
+
+  # Checks the engines against each other on a number of generated ROMs.
+  #
+  # Args:
+  #   num_roms: How many ROMs to generate and check (int)
+  #   seed: Seed for the random level data generator (int)
+  # Returns:
+  #   A minimal failing ROM image, or None if the engines always agreed
+  def Run(self, num_roms: int, seed: int = 0) -> Optional[bytearray]:
+    rng = random.Random(seed)
+    for _ in range(0, num_roms):
+      rom_data = GenerateRomData(rng)
+      if self._GetDifferences(rom_data, timed=True):
+        return self.Shrink(rom_data)
+    return None
+
+  def PrintThroughput(self) -> None:
+    for engine, engine_time in zip(self.engines, self.engine_times):
+      if not engine_time:
+        continue
+      print("%s: %.1f rooms/s, %.2f ROMs/s" %
+            (engine.__name__, 2 * NUM_ROOMS * self.num_roms / engine_time,
+             self.num_roms / engine_time))
+    if self.num_roms:
+      print("Levels owning rooms: %.1f of 9 per ROM" %
+            (self.num_room_owning_levels / self.num_roms))
+
+  def PrintFailure(self, rom_data: bytearray) -> None:
+    print("Engines disagree on this minimal case:")
+    for difference in self._GetDifferences(rom_data):
+      print("  %s" % difference)
+    for room_index in range(0, 2 * NUM_ROOMS):
+      room_data = _GetRoomData(rom_data, room_index)
+      if room_data != BLANK_ROOM_DATA:
+        print("  room %s data: %s" % (_GetRoomName(room_index),
+                                      " ".join("%02X" % byte for byte in room_data)))
+    for level_num in range(0, 9):
+      location = _GetStairwayListLocation(level_num)
+      print("  level %d start room %02X, stairway list %s" %
+            (level_num + 1, rom_data[location - ZeldaRom.START_ROOM_STAIRWAY_ROOM_OFSET],
+             " ".join("%02X" % byte for byte in rom_data[location:location + 10] if byte != 0xFF)))
+
+
+def _LoadEngine(engine_name: str) -> Engine:
+  module_name, function_name = engine_name.rsplit(".", 1)
+  return getattr(importlib.import_module(module_name), function_name)
+
+
+def main(candidate_engine: Engine, num_roms: int, seed: int) -> int:
+  harness = DifferentialHarness(RunLevelMapper, candidate_engine)
+  try:
+    failing_rom_data = harness.Run(num_roms, seed)
+    if failing_rom_data is not None:
+      harness.PrintFailure(failing_rom_data)
+      with open("minimal_failure.nes", "wb") as rom_file:
+        rom_file.write(failing_rom_data)
+      print("Wrote minimal failing ROM to minimal_failure.nes")
+      return 1
+    print("Engines agreed on all %d ROMs" % harness.num_roms)
+    harness.PrintThroughput()
+    return 0
+  finally:
+    harness.Close()
+
+
+if __name__ == "__main__":
+  candidate_engine = RunLevelMapper  # type: Engine
+  num_roms = 100
+  seed = 0
+  for arg in sys.argv[1:]:
+    if arg.startswith("--engine="):
+      candidate_engine = _LoadEngine(arg[len("--engine="):])
+    elif arg.startswith("--roms="):
+      num_roms = int(arg[len("--roms="):])
+    elif arg.startswith("--seed="):
+      seed = int(arg[len("--seed="):])
+
+  sys.exit(main(candidate_engine, num_roms, seed))
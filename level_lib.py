@@ -0,0 +1,81 @@
+import struct
+from typing import List, Optional, Union
+from zelda_constants import ENTRANCE_DIRECTION_MAP
+
+
+class LevelHeader(object):
+  # Each level has 0xFC bytes of special data, laid out as:
+  #   0x00: start room number
+  #   0x01-0x04: (not decoded)
+  #   0x05-0x0E: stairway room list, padded with 0xFF.  The last non-0xFF
+  #     byte is the entrance direction code rather than a room number.
+  #   0x0F-0xFB: (not decoded)
+  RECORD_SIZE = 0xFC
+  STAIRWAY_LIST_OFFSET = 5
+  STAIRWAY_LIST_SIZE = 10
+  RECORD_STRUCT = struct.Struct(
+      "<B%ds%ds%ds" % (STAIRWAY_LIST_OFFSET - 1, STAIRWAY_LIST_SIZE,
+                       RECORD_SIZE - STAIRWAY_LIST_OFFSET - STAIRWAY_LIST_SIZE))
+
+  # Args:
+  #   level_num: The zero-indexed level number this record belongs to (int)
+  #   record: RECORD_SIZE bytes of special level data.  A memoryview is kept
+  #     as is rather than copied (bytes or memoryview)
+  # Raises:
+  #   ValueError: If the record is shorter or longer than RECORD_SIZE
+  def __init__(self, level_num: int, record: Union[bytes, memoryview]) -> None:
+    if len(record) != self.RECORD_SIZE:
+      raise ValueError("Level %d data is %d bytes long instead of %d" %
+                       (level_num + 1, len(record), self.RECORD_SIZE))
+    self.level_num = level_num
+    self.data = record
+    (self.start_room, self.pre_stairway_data, stairway_data,
+     self.post_stairway_data) = self.RECORD_STRUCT.unpack(record)
+
+    # Stairway rooms followed by the entrance direction code.
+    self.stairway_list = [byte for byte in stairway_data if byte != 0xFF]  # type: List[int]
+
+    # This is a hack needed in order to make vanilla L3 work.  For some reason,
+    # the vanilla ROM's data for level 3 doesn't include a stairway room even
+    # though there obviously is one in vanilla level 3.
+    #
+    # See http://www.romhacking.net/forum/index.php?topic=18750.msg271821#msg271821
+    # for more information about why this is the case and why this hack
+    # is needed.
+    if level_num == 2 and not self.stairway_list:
+      self.stairway_list.append(0x0F)
+
+  def GetStartRoomNumber(self) -> int:
+    return self.start_room
+
+  # Returns the non-0xFF bytes of the stairway list, including the trailing
+  # entrance direction code.
+  def GetStairwayList(self) -> List[int]:
+    return list(self.stairway_list)
+
+  def GetStairwayRoomNumberList(self) -> List[int]:
+    return self.stairway_list[:-1]
+
+  def GetEntranceDirectionCode(self) -> Optional[int]:
+    if not self.stairway_list:
+      return None
+    return self.stairway_list[-1]
+
+  # Returns the Direction of the entrance, or None if the code is invalid.
+  def GetEntranceDirection(self) -> Optional[int]:
+    entrance_direction_code = self.GetEntranceDirectionCode()
+    if entrance_direction_code is None:
+      return None
+    return ENTRANCE_DIRECTION_MAP.get(entrance_direction_code)
+
+  # Returns the bytes between the start room and the stairway list, which
+  # aren't decoded.
+  def GetPreStairwayData(self) -> bytes:
+    return self.pre_stairway_data
+
+  # Returns the bytes after the stairway list, which aren't decoded.
+  def GetPostStairwayData(self) -> bytes:
+    return self.post_stairway_data
+
+  def GetData(self) -> bytes:
+    return bytes(self.data)
@@ -1,41 +1,164 @@
+import hashlib
+import os
 import sys
-from typing import List
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from room_lib import LevelRoom
 from zelda_rom import ZeldaRom
 import zelda_constants
 from zelda_constants import Direction
+from zelda_constants import ENTRANCE_DIRECTION_MAP
 from zelda_constants import ITEMS
 
-ENTRANCE_DIRECTION_MAP = {
-  1: Direction.NORTH,
-  2: Direction.SOUTH,
-  3: Direction.WEST,
-  4: Direction.EAST
+
+# The missing item for each traversal MapLevels does, in order.  None means
+# that we have all items.
+MISSING_ITEM_CASES = [
+    None, zelda_constants.RECORDER, zelda_constants.BOW, zelda_constants.BLUE_RING,
+    zelda_constants.LADDER
+]  # type: List[Optional[int]]
+
+# While finding routes, _VisitDungeonRoom records the doors it went through in
+# each room as a bit mask with len(MISSING_ITEM_CASES) bits per direction, one
+# for each case.
+ROUTE_DIRECTIONS = (Direction.WEST, Direction.NORTH, Direction.EAST, Direction.SOUTH)
+ROUTE_EXIT_BITS = {
+    direction: 1 << (len(MISSING_ITEM_CASES) * direction_num)
+    for direction_num, direction in enumerate(ROUTE_DIRECTIONS)
 }
 
+# A route is a tuple of (rooms traveled, shutter doors, bomb holes, locked
+# doors), counted from the start room.
+Route = Tuple[int, int, int, int]
+
+# While searching, routes are packed into ints with one byte per field and
+# the distance in the top byte, so that packed routes sort the same way as
+# Route tuples and taking a step is a single addition.  The routes for all of
+# MISSING_ITEM_CASES are kept side by side in one int, in 32-bit lanes (the
+# lowest lane for the first case), so that one addition steps every case.
+ROUTE_STEP = 1 << 24
+ROUTE_LANE_BITS = 32
+ROUTE_LANE_MASK = (1 << ROUTE_LANE_BITS) - 1
+ROUTE_ALL_LANES = sum(1 << (ROUTE_LANE_BITS * case_num)
+                      for case_num in range(0, len(MISSING_ITEM_CASES)))
+ROUTE_STEPS_BY_WALL_TYPE = tuple(
+    ROUTE_ALL_LANES * (ROUTE_STEP + ((wall_type == zelda_constants.SHUTTER_DOOR_WALL_TYPE) << 16) +
+                       ((wall_type == zelda_constants.BOMB_HOLE_WALL_TYPE) << 8) +
+                       (wall_type in zelda_constants.LOCKED_DOOR_WALL_TYPES))
+    for wall_type in range(0, 8))
+# Indexed by a bit mask of cases, the lanes belonging to those cases.
+ROUTE_LANE_MASKS_BY_CASE_MASK = tuple(
+    sum(ROUTE_LANE_MASK << (ROUTE_LANE_BITS * case_num)
+        for case_num in range(0, len(MISSING_ITEM_CASES))
+        if case_mask & (1 << case_num))
+    for case_mask in range(0, 1 << len(MISSING_ITEM_CASES)))
+
+
+def _UnpackRoute(packed_route: int) -> Route:
+  return (packed_route >> 24, (packed_route >> 16) & 0xFF, (packed_route >> 8) & 0xFF,
+          packed_route & 0xFF)
+
+
+def _GetRouteText(route: Route) -> str:
+  return "%d rooms (%d shutter, %d bomb, %d locked)" % route
+
+
 class LevelMapper(object):
 
-  def __init__(self, rom: ZeldaRom, decode_mode: bool = False) -> None:
+  def __init__(self, rom: ZeldaRom, decode_mode: bool = False, find_routes: bool = False) -> None:
     self.rooms_1_6 = []  # type: List[LevelRoom]
     self.rooms_7_9 = []  # type: List[LevelRoom]
     self.start_rooms = []  # type: List[int]
     self.stairway_rooms = []  # type: List[List[int]]
     self.entrance_directions = [] 
     self.special_items = []  # type: List[List[int]]
+    # For each level, maps the missing item (None if we have all items) to
+    # the shortest route to each special item reachable without it.  Only
+    # filled in by MapLevels if find_routes is set.
+    self.item_routes = []  # type: List[Dict[Optional[int], Dict[int, Route]]]
     self.decode_mode = decode_mode
+    self.find_routes = find_routes
+
+    # While finding routes, what _VisitDungeonRoom did in the current level,
+    # each as a bit mask of the MISSING_ITEM_CASES it did so in: the doors it
+    # went through in each room (see ROUTE_EXIT_BITS), whether it picked up
+    # each room's floor item, and the stairway passages it took and stairway
+    # items it picked up.  The last two are keyed by what they were at the
+    # time, since MapLevels' first traversal can run before every stairway
+    # room has been set up.
+    self.route_case_bit = 0
+    self.route_exits = []  # type: List[int]
+    self.route_floor_items = []  # type: List[int]
+    self.route_passages = {}  # type: Dict[Tuple[int, int], int]
+    self.route_stairway_items = {}  # type: Dict[Tuple[int, int], int]
 
     # Import data from the ROM classs
     for room_num in range(0, 0x80):
       self.rooms_1_6.append(rom.GetLevelRoom(room_num, is7to9=False, decode_mode=self.decode_mode))
       self.rooms_7_9.append(rom.GetLevelRoom(room_num, is7to9=True, decode_mode=self.decode_mode))
     for level_num in range(0, 9):
-      self.start_rooms.append(rom.GetLevelStartRoomNumber(level_num))
-      stairway_list = rom.GetLevelStairwayRoomNumberList(level_num)
-      #entrance_direction = Direction.NORTH
-      entrance_direction = ENTRANCE_DIRECTION_MAP[stairway_list.pop()]
-      self.entrance_directions.append(entrance_direction)
-      self.stairway_rooms.append(stairway_list)
+      self.start_rooms.append(0)
+      self.entrance_directions.append(Direction.NORTH)
+      self.stairway_rooms.append([])
       self.special_items.append([])
+      self.item_routes.append({})
+      self._ImportLevelData(rom, level_num)
+
+  def _ImportLevelData(self, rom: ZeldaRom, level_num: int) -> None:
+    self.start_rooms[level_num] = rom.GetLevelStartRoomNumber(level_num)
+    stairway_list = rom.GetLevelStairwayRoomNumberList(level_num)
+    #entrance_direction = Direction.NORTH
+    entrance_direction = ENTRANCE_DIRECTION_MAP[stairway_list.pop()]
+    self.entrance_directions[level_num] = entrance_direction
+    self.stairway_rooms[level_num] = stairway_list
+    self.special_items[level_num] = []
+    self.item_routes[level_num] = {}
+
+  # Re-reads ROM data for the given levels and maps them again.
+  #
+  # Levels 1-6 and levels 7-9 each share a single set of room objects, so a
+  # change to any level in a group means the whole group has to be re-read
+  # and re-mapped in order for room ownership to come out the same as a
+  # fresh run.  The other group is left untouched.  If reading or mapping
+  # fails, the mapper is restored to the state it was in before the call.
+  #
+  # Args:
+  #   rom: The (already reloaded) ROM to read from
+  #   level_nums: Zero-indexed numbers of the levels whose data changed
+  # Returns:
+  #   The zero-indexed numbers of all levels that were re-mapped (List[int])
+  def ReloadLevels(self, rom: ZeldaRom, level_nums: Iterable[int]) -> List[int]:
+    # Re-mapping only ever replaces these lists (or their elements), never
+    # the room objects in the old room lists, so shallow copies are enough
+    # to put things back the way they were.
+    saved_state = {}  # type: Dict[str, List]
+    for attribute_name in ("rooms_1_6", "rooms_7_9", "start_rooms", "stairway_rooms",
+                           "entrance_directions", "special_items", "item_routes"):
+      saved_state[attribute_name] = list(getattr(self, attribute_name))
+
+    # level_nums is checked once per group, so it can't be a one-shot iterator.
+    changed_levels = set(level_nums)
+    remapped_levels = []  # type: List[int]
+    try:
+      for is7to9, group_levels in ((False, range(0, 6)), (True, range(6, 9))):
+        if changed_levels.isdisjoint(group_levels):
+          continue
+        rooms = []  # type: List[LevelRoom]
+        for room_num in range(0, 0x80):
+          rooms.append(rom.GetLevelRoom(room_num, is7to9=is7to9, decode_mode=self.decode_mode))
+        if is7to9:
+          self.rooms_7_9 = rooms
+        else:
+          self.rooms_1_6 = rooms
+        for level_num in group_levels:
+          self._ImportLevelData(rom, level_num)
+        self.MapLevels(group_levels)
+        remapped_levels.extend(group_levels)
+    except Exception:
+      for attribute_name, value in saved_state.items():
+        setattr(self, attribute_name, value)
+      raise
+    return remapped_levels
 
   def _GetRoom(self, room_num: int, level_num: int) -> LevelRoom:
     if level_num in [0, 1, 2, 3, 4, 5]:  # Levels 1-6 but zero-indexed
@@ -80,15 +203,23 @@ class LevelMapper(object):
       return
     room.MarkAsVisited()
     room.SetLevelNumber(level_num)
+    route_case_bit = self.route_case_bit
     # Attempt to pick up "special" floor item and stairway item
     if (room.GetItemType() in zelda_constants.SPECIAL_ITEMS or
         room.GetItemType() == zelda_constants.TRINGLE):
       if room.CanDefeatEnemiesOrGetItemWithoutDoingSo(missing_item):
         self.special_items[level_num].append(room.GetItemType())
+        if route_case_bit:
+          self.route_floor_items[room_num] |= route_case_bit
     if (room.HasStairwayItem() and room.CanDefeatEnemiesOrBlockClipOrRightStairs(missing_item)):
       self.special_items[level_num].append(room.GetStairwayItem())
+      if route_case_bit:
+        stairway_item = (room_num, room.GetStairwayItem())
+        self.route_stairway_items[stairway_item] = (
+            self.route_stairway_items.get(stairway_item, 0) | route_case_bit)
 
     # Attempt to visit adjoining rooms unless blocked
+    route_exits = 0
     for direction in (Direction.WEST, Direction.NORTH, Direction.EAST, Direction.SOUTH):
       if room.CanMove(direction):
         # Don't leave back to the overworld
@@ -100,14 +231,108 @@ class LevelMapper(object):
         if (missing_item == zelda_constants.LADDER and
             not room.CanMoveWithoutLadder(entry_door, direction)):
           continue
+        if route_case_bit:
+          route_exits |= ROUTE_EXIT_BITS[direction]
         self._VisitDungeonRoom(
             room_num + direction,
             -1 * direction,
             level_num,
             missing_item)
+    if route_case_bit:
+      self.route_exits[room_num] |= route_exits * route_case_bit
     if room.HasStairwayPassageRoom() and room.CanDefeatEnemiesOrBlockClipOrRightStairs(missing_item):
+        if route_case_bit:
+          passage = (room_num, room.GetStairwayPassageRoom())
+          self.route_passages[passage] = self.route_passages.get(passage, 0) | route_case_bit
         self._VisitDungeonRoom(room.GetStairwayPassageRoom(), 0, level_num, missing_item)
 
+  # Finds the shortest route from the level's start room to every special item
+  # for all of MISSING_ITEM_CASES at once.
+  #
+  # Rather than re-deciding where Link can go, this only follows the doors and
+  # passages that _VisitDungeonRoom recorded while mapping the level, and
+  # only reports the items it picked up.  That way a route exists for an item
+  # exactly when MapLevels found the item, so routes never contradict its
+  # block warnings.  (Whether a ladder is needed depends on which door a room
+  # was first entered from, so re-deciding could reach rooms that the mapper
+  # didn't.)
+  #
+  # It's a breadth-first search over rooms in which each room carries a bit
+  # mask of the cases that have reached it so far.  Taking a stairway passage
+  # counts as one room, as does going down the stairs to a stairway item.
+  #
+  # Args:
+  #   level_num: The zero-indexed level to search (int)
+  # Returns:
+  #   For each missing item case, the shortest route to each item picked up
+  #   (Dict[Optional[int], Dict[int, Route]])
+  def _GetItemRoutes(self, level_num: int) -> Dict[Optional[int], Dict[int, Route]]:
+    item_routes = {}  # type: Dict[Optional[int], Dict[int, Route]]
+    for missing_item in MISSING_ITEM_CASES:
+      item_routes[missing_item] = {}
+    start_room = self.start_rooms[level_num]
+    if start_room < 0x0 or start_room > 0x7F:
+      return item_routes
+
+    # The moves out of each room as (next room, route step, case mask).
+    num_cases = len(MISSING_ITEM_CASES)
+    all_cases_mask = (1 << num_cases) - 1
+    next_moves = [[] for _ in range(0, 0x80)]  # type: List[List[Tuple[int, int, int]]]
+    for (room_num, next_room_num), case_mask in self.route_passages.items():
+      next_moves[room_num].append((next_room_num, ROUTE_ALL_LANES * ROUTE_STEP, case_mask))
+    for room_num, route_exits in enumerate(self.route_exits):
+      if not route_exits:
+        continue
+      room = self._GetRoom(room_num, level_num)
+      moves = next_moves[room_num]
+      for direction in ROUTE_DIRECTIONS:
+        case_mask = route_exits & all_cases_mask
+        route_exits >>= num_cases
+        if case_mask and 0x0 <= room_num + direction <= 0x7F:
+          moves.append((room_num + direction, ROUTE_STEPS_BY_WALL_TYPE[room.GetWallType(direction)],
+                        case_mask))
+
+    # packed_routes[room_num] holds the packed route to a room for each case
+    # that has reached it, in that case's lane.  Cases whose traversal never
+    # ran have nothing recorded, so it's safe to start all of them in the
+    # start room.
+    packed_routes = [0] * 0x80
+    reached_masks = [0] * 0x80
+    reached_masks[start_room] = all_cases_mask
+    frontier = {start_room: all_cases_mask}
+    while frontier:
+      next_frontier = {}  # type: Dict[int, int]
+      for room_num, room_mask in frontier.items():
+        for next_room_num, route_step, move_mask in next_moves[room_num]:
+          new_mask = room_mask & move_mask & ~reached_masks[next_room_num]
+          if not new_mask:
+            continue
+          reached_masks[next_room_num] |= new_mask
+          next_frontier[next_room_num] = next_frontier.get(next_room_num, 0) | new_mask
+          packed_routes[next_room_num] |= (
+              (packed_routes[room_num] + route_step) & ROUTE_LANE_MASKS_BY_CASE_MASK[new_mask])
+      frontier = next_frontier
+
+    # Going down the stairs to a stairway item counts as one more room.
+    pickups = [
+        (room_num, self._GetRoom(room_num, level_num).GetItemType(), 0, case_mask)
+        for room_num, case_mask in enumerate(self.route_floor_items) if case_mask
+    ]  # type: List[Tuple[int, int, int, int]]
+    for (room_num, item), case_mask in self.route_stairway_items.items():
+      pickups.append((room_num, item, ROUTE_STEP, case_mask))
+    packed_item_routes = [{} for _ in range(0, num_cases)]  # type: List[Dict[int, int]]
+    for room_num, item, extra_distance, case_mask in pickups:
+      for case_num in range(0, num_cases):
+        if case_mask & (1 << case_num):
+          packed_route = (((packed_routes[room_num] >> (ROUTE_LANE_BITS * case_num)) &
+                           ROUTE_LANE_MASK) + extra_distance)
+          if packed_route < packed_item_routes[case_num].get(item, packed_route + 1):
+            packed_item_routes[case_num][item] = packed_route
+    for case_num, missing_item in enumerate(MISSING_ITEM_CASES):
+      for item, packed_route in packed_item_routes[case_num].items():
+        item_routes[missing_item][item] = _UnpackRoute(packed_route)
+    return item_routes
+
   # Returns True only for the stairway passage case (to increment stair #)
   def _VisitStairwayRoom(self, room_num: int, level_num: int, stairway_num: int) -> bool:
 
@@ -130,8 +355,14 @@ class LevelMapper(object):
     self._GetRoom(left_room, level_num).SetStairwayItem(stairway_item)
     return False
 
-  def MapLevels(self) -> None:
-    for level_num in range(0, 9):
+  def MapLevels(self, level_nums: Iterable[int] = range(0, 9)) -> None:
+    for level_num in level_nums:
+      if self.find_routes:
+        self.route_exits = [0] * 0x80
+        self.route_floor_items = [0] * 0x80
+        self.route_passages = {}
+        self.route_stairway_items = {}
+        self.route_case_bit = 1 << MISSING_ITEM_CASES.index(None)
       # Visit dungeon assuming we won't get blocked (i.e. have all items)
       stairway_letter = 1
       for stairway_room in self.stairway_rooms[level_num]:
@@ -147,10 +378,9 @@ class LevelMapper(object):
         all_items_in_level.append(item)
 
       # Now, to find blocks!
-      for missing_item in [
-          zelda_constants.RECORDER, zelda_constants.BOW, zelda_constants.BLUE_RING,
-          zelda_constants.LADDER
-      ]:
+      for missing_item in MISSING_ITEM_CASES[1:]:
+        if self.find_routes:
+          self.route_case_bit = 1 << MISSING_ITEM_CASES.index(missing_item)
         self.special_items[level_num] = []
         self._VisitDungeonRoom(
             self.start_rooms[level_num], self.entrance_directions[level_num], level_num, 
@@ -161,42 +391,156 @@ class LevelMapper(object):
                                                                ITEMS[item_in_level]))
         self._ClearAllVisitMarkers(level_num >= 6)
 
-  def PrintLevelInfo(self) -> None:
-    for level_num in range(0, 9):
-      left_offset = self._GetLeftOffset(level_num)
-      right_offset = self._GetRightOffset(level_num)
+      if self.find_routes:
+        self.route_case_bit = 0
+        self.item_routes[level_num] = self._GetItemRoutes(level_num)
+
+  def GetLevelMapLines(self, level_num: int) -> List[str]:
+    left_offset = self._GetLeftOffset(level_num)
+    right_offset = self._GetRightOffset(level_num)
+    map_lines = []  # type: List[str]
+    for y_coord in range(0, 8):
+      room_texts = []  # type: List[List[str]]
+      for x_coord in range(left_offset, right_offset + 1):
+        room = self._GetRoom(0x10 * y_coord + x_coord, level_num)
+        if level_num == room.GetLevelNumber():
+          room_texts.append(room.GetAsciiText())
+        else:
+          room_texts.append(["            "] * 5)
+      for line in range(0, 5):
+        map_lines.append("".join(room_text[line] for room_text in room_texts))
+    return map_lines
+
+  def PrintLevelInfo(self, level_nums: Iterable[int] = range(0, 9)) -> None:
+    for level_num in level_nums:
       print("")
       print("Level %d map" % (level_num + 1))
-      for y_coord in range(0, 8):
-        for line in range(0, 5):
-          for x_coord in range(left_offset, right_offset + 1):
-            room = self._GetRoom(0x10 * y_coord + x_coord, level_num)
-            if level_num == room.GetLevelNumber():
-              sys.stdout.write(room.GetAsciiText()[line])
-            else:
-              sys.stdout.write("            ")
-          print("")
-
-  def PrintLevelItems(self) -> None:
-    for level_num in range(0, 9):
+      for map_line in self.GetLevelMapLines(level_num):
+        print(map_line)
+
+  def PrintLevelItems(self, level_nums: Iterable[int] = range(0, 9)) -> None:
+    for level_num in level_nums:
       for item in self.special_items[level_num]:
         # We know levels 1-8 all have tringles
         if not item == zelda_constants.TRINGLE:
           print("Level %d contains %s" % (level_num + 1, ITEMS[item]))
 
+  def PrintLevelRoutes(self, level_nums: Iterable[int] = range(0, 9)) -> None:
+    for level_num in level_nums:
+      full_routes = self.item_routes[level_num].get(None, {})
+      for item in sorted(full_routes.keys()):
+        print("Level %d %s: %s" % (level_num + 1, ITEMS[item], _GetRouteText(full_routes[item])))
+        for missing_item, routes in self.item_routes[level_num].items():
+          if missing_item is None:
+            continue
+          if item in routes:
+            print("  without %s: %s" % (ITEMS[missing_item], _GetRouteText(routes[item])))
+          else:
+            print("  without %s: unreachable" % ITEMS[missing_item])
+
+
+# Hashes the ROM regions that each level's map depends on: the six room
+# tables shared by the level's group (1-6 or 7-9) and the level's own block
+# of special data.
+def _GetLevelRegionHashes(rom: ZeldaRom, decode_mode: bool = False) -> List[Tuple[bytes, bytes]]:
+  table_hashes = {}  # type: Dict[bool, bytes]
+  for is7to9 in (False, True):
+    table_data = rom.GetLevelRoomTableData(is7to9=is7to9, decode_mode=decode_mode)
+    table_hashes[is7to9] = hashlib.sha1(bytes(table_data)).digest()
+  region_hashes = []  # type: List[Tuple[bytes, bytes]]
+  for level_num in range(0, 9):
+    special_data = rom.GetSpecialLevelData(level_num)
+    region_hashes.append((table_hashes[level_num >= 6],
+                          hashlib.sha1(bytes(special_data)).digest()))
+  return region_hashes
 
-def main(input_filename: str, decode_mode: bool = False) -> None:
+
+def main(input_filename: str, decode_mode: bool = False, print_routes: bool = False) -> None:
   level_mapper = LevelMapper(
-      ZeldaRom(input_filename), decode_mode=decode_mode)
+      ZeldaRom(input_filename), decode_mode=decode_mode, find_routes=print_routes)
   level_mapper.MapLevels()
   level_mapper.PrintLevelInfo()
   level_mapper.PrintLevelItems()
+  if print_routes:
+    level_mapper.PrintLevelRoutes()
+
+
+# Maps and prints every level once, then polls the ROM file for changes and
+# re-maps and re-prints only the levels affected by each save.
+#
+# Args:
+#   input_filename: Full path/filename of the ROM to watch (string)
+#   decode_mode: Whether to read rooms via the encoded tables (bool)
+#   poll_interval: Seconds to wait between checks of the file's mtime (float)
+def watch(input_filename: str, decode_mode: bool = False, poll_interval: float = 0.05) -> None:
+  rom = ZeldaRom(input_filename)
+  level_mapper = LevelMapper(rom, decode_mode=decode_mode)
+  level_mapper.MapLevels()
+  level_mapper.PrintLevelInfo()
+  level_mapper.PrintLevelItems()
+  region_hashes = _GetLevelRegionHashes(rom, decode_mode)
+  level_maps = [level_mapper.GetLevelMapLines(level_num) for level_num in range(0, 9)]
+  level_items = [list(items) for items in level_mapper.special_items]
+  last_mtime = os.stat(input_filename).st_mtime_ns
+  print("")
+  print("Watching %s for changes (Ctrl-C to stop) ..." % input_filename)
+
+  try:
+    while True:
+      time.sleep(poll_interval)
+      try:
+        mtime = os.stat(input_filename).st_mtime_ns
+      except OSError:
+        continue  # The editor may be in the middle of replacing the file.
+      if mtime == last_mtime:
+        continue
+      last_mtime = mtime
+      start_time = time.perf_counter()
+      try:
+        rom.Reload()
+        new_region_hashes = _GetLevelRegionHashes(rom, decode_mode)
+        changed_levels = [
+            level_num for level_num in range(0, 9)
+            if new_region_hashes[level_num] != region_hashes[level_num]
+        ]
+        if not changed_levels:
+          continue
+        remapped_levels = level_mapper.ReloadLevels(rom, changed_levels)
+      except (AssertionError, KeyError, IndexError, OSError, ValueError):
+        # The editor may be in the middle of replacing the file, or a
+        # partially-written file can yield garbage level data; wait for the
+        # next save rather than dying.
+        print("Warning: couldn't map %s; waiting for next save" % input_filename)
+        continue
+      # A change to the shared room tables means the whole group is re-mapped,
+      # but only levels whose own special data changed, or whose map or items
+      # came out different, are re-printed.
+      levels_to_print = []  # type: List[int]
+      for level_num in remapped_levels:
+        level_map = level_mapper.GetLevelMapLines(level_num)
+        items = list(level_mapper.special_items[level_num])
+        if (new_region_hashes[level_num][1] != region_hashes[level_num][1] or
+            level_map != level_maps[level_num] or items != level_items[level_num]):
+          levels_to_print.append(level_num)
+        level_maps[level_num] = level_map
+        level_items[level_num] = items
+      region_hashes = new_region_hashes
+      level_mapper.PrintLevelInfo(levels_to_print)
+      level_mapper.PrintLevelItems(levels_to_print)
+      print("")
+      print("Re-mapped level(s) %s in %.1f ms" %
+            (", ".join(str(level_num + 1) for level_num in levels_to_print) or "(none changed)",
+             (time.perf_counter() - start_time) * 1000))
+  except KeyboardInterrupt:
+    pass
 
 
 if __name__ == "__main__":
-  decode_mode = False
-  if len(sys.argv) > 2:
-    if sys.argv[2] == "--decode_mode":
-      decode_mode = True
+  decode_mode = "--decode_mode" in sys.argv[2:]
+  watch_mode = "--watch" in sys.argv[2:]
+  print_routes = "--routes" in sys.argv[2:]
 
-  main(sys.argv[1], decode_mode)
+  if watch_mode:
+    watch(sys.argv[1], decode_mode)
+  else:
+    main(sys.argv[1], decode_mode, print_routes)
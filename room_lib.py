@@ -1,13 +1,60 @@
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Tuple
 from zelda_constants import Direction
 import zelda_constants
 
+NUM_ROOM_TYPES = 0x40
+NUM_ENEMY_TYPES = 0x40
+NUM_WALL_TYPES = 0x08
+
+
+def _BuildEnemyText(has_mixed_enemies: bool, num_enemies: int, enemy_type: int) -> str:
+  actual_num_enemies = ""
+  if enemy_type > 0:
+    actual_num_enemies = zelda_constants.ENEMY_COUNT_TEXT[num_enemies]
+  if has_mixed_enemies:
+    if enemy_type in zelda_constants.MIX_ENEMY_NAME.keys():
+      return zelda_constants.MIX_ENEMY_NAME[enemy_type]
+    return "Mix: %s %x" % (actual_num_enemies, enemy_type)
+  return ("%s %s" % (actual_num_enemies, zelda_constants.ENEMY_NAME[enemy_type]))
+
+
+# Lookup tables, built once at import, that the LevelRoom predicates and text
+# methods index into instead of branching on every call.
+
+# Indexed by has_mixed_enemies << 8 | num_enemies << 6 | enemy_type
+_ENEMY_TEXT = tuple(
+    _BuildEnemyText(has_mixed_enemies, num_enemies, enemy_type)
+    for has_mixed_enemies in (False, True)
+    for num_enemies in range(0, 4)
+    for enemy_type in range(0, NUM_ENEMY_TYPES))  # type: Tuple[str, ...]
+
+# Indexed by enemy_type
+_ITEMS_NEEDED_TO_DEFEAT_ENEMY_TYPE = tuple(
+    frozenset(item for item, enemy_types in zelda_constants.ENEMY_TYPES_NEEDING_ITEM.items()
+              if enemy_type in enemy_types)
+    for enemy_type in range(0, NUM_ENEMY_TYPES))  # type: Tuple[FrozenSet[int], ...]
+
+# Indexed by room_type
+_LADDER_BLOCKED_DIRECTIONS = tuple(
+    frozenset(zelda_constants.LADDER_BLOCKED_DIRECTIONS.get(room_type, []))
+    for room_type in range(0, NUM_ROOM_TYPES))  # type: Tuple[FrozenSet[int], ...]
+_CAN_BLOCK_CLIP_OR_RIGHT_STAIRS = tuple(
+    room_type in (zelda_constants.DIAMOND_ROOM_TYPE, zelda_constants.RIGHT_STAIRS_ROOM_TYPE)
+    for room_type in range(0, NUM_ROOM_TYPES))  # type: Tuple[bool, ...]
+_ROOM_TYPE_TEXT = tuple(
+    zelda_constants.ROOM_TYPES.get(room_type, "room %x?" % room_type)
+    for room_type in range(0, NUM_ROOM_TYPES))  # type: Tuple[str, ...]
+
+# Indexed by wall type
+_CAN_MOVE_WITHOUT_OPENING_SHUTTERS = tuple(
+    wall_type not in (1, 7)  # solid wall or shutter
+    for wall_type in range(0, NUM_WALL_TYPES))  # type: Tuple[bool, ...]
+
 
 class LevelRoom(object):
 
   def __init__(self, rom_data: List[int]) -> None:
     self.has_zola = 0
-    self.enemy_type_counts = [3, 5, 6, 8]  # type: List[int]
     self.wall_type = {}  # type: Dict[int, int]
     self.rom_data = rom_data
 
@@ -30,6 +77,15 @@ class LevelRoom(object):
     self.item_type = rom_data[4] & 0x1F
     self.is_drop_item = True if (rom_data[5] >> 2) & 0x01 == 1 else False
 
+    # Values looked up from the tables above
+    self.enemy_text = _ENEMY_TEXT[(self.has_mixed_enemies << 8) | (self.num_enemies << 6) |
+                                  self.enemy_type]
+    self.items_needed_to_defeat_enemies = (
+        frozenset() if self.has_mixed_enemies else
+        _ITEMS_NEEDED_TO_DEFEAT_ENEMY_TYPE[self.enemy_type])  # type: FrozenSet[int]
+    self.ladder_blocked_directions = _LADDER_BLOCKED_DIRECTIONS[self.room_type]
+    self.can_block_clip_or_right_stairs = _CAN_BLOCK_CLIP_OR_RIGHT_STAIRS[self.room_type]
+
     # Non-ROM values
     self.already_visited = False
     self.level_num = 0xff
@@ -38,43 +94,22 @@ class LevelRoom(object):
     self.stairway_item = -1
 
   def GetEnemyText(self) -> str:
-    actual_num_enemies = ""
-    # TODO: Use a lookup table here instead
-    if self.enemy_type > 0:
-      if self.num_enemies == 0:
-        actual_num_enemies = "3"
-      elif self.num_enemies == 1:
-        actual_num_enemies = "5"
-      elif self.num_enemies == 2:
-        actual_num_enemies = "6"
-      elif self.num_enemies == 3:
-        actual_num_enemies = "8"
-
-    if self.has_mixed_enemies:
-      if self.enemy_type in zelda_constants.MIX_ENEMY_NAME.keys():
-        return zelda_constants.MIX_ENEMY_NAME[self.enemy_type]
-      return "Mix: %s %x" % (actual_num_enemies, self.enemy_type)
-    return ("%s %s" % (actual_num_enemies, zelda_constants.ENEMY_NAME[self.enemy_type]))
+    return self.enemy_text
+
+  def GetWallType(self, direction: int) -> int:
+    return self.wall_type[direction]
 
   def CanMove(self, direction: int) -> bool:
     return self.wall_type[direction] != 1  # sold wall
 
   def CanMoveWithoutOpeningShutters(self, direction: int) -> bool:
-    return self.wall_type[direction] not in [1, 7]  # solid wall or shutter
+    return _CAN_MOVE_WITHOUT_OPENING_SHUTTERS[self.wall_type[direction]]
 
   def CanMoveWithoutLadder(self, entry_direction: int, exit_direction: int) -> bool:
-    if self.room_type == 0x12:  # T Room
-      return not (entry_direction == Direction.SOUTH or exit_direction == Direction.SOUTH)
-    if self.room_type == 0x13:  # "E River"
-      return not (entry_direction == Direction.EAST or exit_direction == Direction.EAST)
-    if self.room_type == 0x16:  # "Chevy" room
-      return False
-    if self.room_type == 0x18:  # TopRivr
-      return not (entry_direction == Direction.NORTH or exit_direction == Direction.NORTH)
-    if self.room_type == 0x19:  # = River
-      return (not (entry_direction == Direction.NORTH or exit_direction == Direction.NORTH) and
-              not (entry_direction == Direction.SOUTH or exit_direction == Direction.SOUTH))
-    return True
+    # Exits are always one of the four directions, so a room type that blocks
+    # all four (e.g. "Chevy") can never be crossed without the ladder.
+    return not (entry_direction in self.ladder_blocked_directions or
+                exit_direction in self.ladder_blocked_directions)
 
   def CanDefeatEnemiesOrGetItemWithoutDoingSo(self, missing_item: int) -> bool:
     if not self.is_drop_item:
@@ -82,23 +117,11 @@ class LevelRoom(object):
     return self.CanDefeatEnemies(missing_item)
 
   def CanDefeatEnemiesOrBlockClipOrRightStairs(self, missing_item: int) -> bool:
-    if self.room_type in (zelda_constants.DIAMOND_ROOM_TYPE,
-                          zelda_constants.RIGHT_STAIRS_ROOM_TYPE):
-      return True
-    return self.CanDefeatEnemies(missing_item)
+    return (self.can_block_clip_or_right_stairs or
+            missing_item not in self.items_needed_to_defeat_enemies)
 
   def CanDefeatEnemies(self, missing_item: int) -> bool:
-    if (missing_item == zelda_constants.RECORDER and not self.has_mixed_enemies and
-        self.enemy_type in zelda_constants.DIGDOGGER_ENEMY_TYPES):
-      return False
-    if (missing_item == zelda_constants.BOW and not self.has_mixed_enemies and
-        self.enemy_type in zelda_constants.GOHMA_ENEMY_TYPES):
-      return False
-    if missing_item in [zelda_constants.RED_RING, zelda_constants.BLUE_RING]:
-      if (not self.has_mixed_enemies and
-          self.enemy_type in zelda_constants.HARD_COMBAT_ENEMY_TYPES):
-        return False
-    return True
+    return missing_item not in self.items_needed_to_defeat_enemies
 
   def HasStairwayItem(self) -> bool:
     return self.stairway_item > 0
@@ -144,9 +167,7 @@ class LevelRoom(object):
     return self.room_type
 
   def GetRoomTypeText(self) -> str:
-    if self.room_type in zelda_constants.ROOM_TYPES.keys():
-      return zelda_constants.ROOM_TYPES[self.room_type]
-    return "room %x?" % self.room_type
+    return _ROOM_TYPE_TEXT[self.room_type]
 
   def GetItemType(self) -> int:
     return self.item_type
@@ -6,6 +6,15 @@ class Direction(object):
   EAST = 0x1
 
 
+# Maps the entrance direction code at the end of a level's stairway list to
+# the direction the level is entered from.
+ENTRANCE_DIRECTION_MAP = {
+    1: Direction.NORTH,
+    2: Direction.SOUTH,
+    3: Direction.WEST,
+    4: Direction.EAST
+}
+
 DOOR_TYPES = {
     0: "Door",
     1: "Wall",
@@ -28,6 +37,11 @@ WALL_TYPE_CHAR = {
     7: ("S", "S"),
 }
 
+SOLID_WALL_TYPE = 1
+BOMB_HOLE_WALL_TYPE = 4
+LOCKED_DOOR_WALL_TYPES = [5, 6]
+SHUTTER_DOOR_WALL_TYPE = 7
+
 CAVE_BLOCK_TYPE = {
     0x00: "",  # No cave
     0x01: "OpenCave",
@@ -150,9 +164,12 @@ MIX_ENEMY_NAME = {
     0x3C: "LLBblWiz"
 }
 
-GOHMA_ENEMY_TYPES = [0x33, 0x34]
-DIGDOGGER_ENEMY_TYPES = [0x38, 0x39]
-HARD_COMBAT_ENEMY_TYPES = [0x0C, 0x23]
+GOHMA_ENEMY_TYPES = frozenset([0x33, 0x34])
+DIGDOGGER_ENEMY_TYPES = frozenset([0x38, 0x39])
+HARD_COMBAT_ENEMY_TYPES = frozenset([0x0C, 0x23])
+
+# The display text for each value of a room's 2-bit enemy count.
+ENEMY_COUNT_TEXT = ("3", "5", "6", "8")
 
 ROOM_TYPES = {
     0x00: "Empty",
@@ -237,3 +254,21 @@ LADDER = 0x0D
 
 DIAMOND_ROOM_TYPE = 0x1A
 RIGHT_STAIRS_ROOM_TYPE = 0x1B
+
+# Doors that can't be used, either to enter or to leave, in each room type
+# that has water in it unless Link has the ladder.
+LADDER_BLOCKED_DIRECTIONS = {
+    0x12: [Direction.SOUTH],  # T Room
+    0x13: [Direction.EAST],  # E River
+    0x16: [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST],  # Chevy
+    0x18: [Direction.NORTH],  # TopRivr
+    0x19: [Direction.NORTH, Direction.SOUTH],  # = River
+}
+
+# The enemy types that can't be defeated without each item.
+ENEMY_TYPES_NEEDING_ITEM = {
+    RECORDER: DIGDOGGER_ENEMY_TYPES,
+    BOW: GOHMA_ENEMY_TYPES,
+    RED_RING: HARD_COMBAT_ENEMY_TYPES,
+    BLUE_RING: HARD_COMBAT_ENEMY_TYPES,
+}
@@ -1,4 +1,5 @@
-from typing import List
+from typing import List, Optional
+from level_lib import LevelHeader
 from room_lib import LevelRoom
 
 
@@ -20,11 +21,11 @@ class ZeldaRom(object):
 
   # In a level's data, the byte where the stairway room list starts is always
   # exactly five bytes after the memory location of the start room.
-  START_ROOM_STAIRWAY_ROOM_OFSET = 5
+  START_ROOM_STAIRWAY_ROOM_OFSET = LevelHeader.STAIRWAY_LIST_OFFSET
 
   # The specialized data for levels (starting around 0x1942B) is exactly this
   # number of bytes long.
-  SPECIAL_LEVEL_DATA_OFFSET = 0xFC
+  SPECIAL_LEVEL_DATA_OFFSET = LevelHeader.RECORD_SIZE
 
   # Reads a Nintendo ROM file from disk and opens it as a binary file.
   #
@@ -32,8 +33,18 @@ class ZeldaRom(object):
   #  rom_filename: Full path/filename of the ROM to open (string)
   def __init__(self, rom_filename: str, write_mode: bool=False) -> None:
     print("Opening %s ..." % rom_filename)
-    mode_string = "r+b" if write_mode else "rb"
-    self.rom_file = open(rom_filename, mode_string)
+    self.rom_filename = rom_filename
+    self.mode_string = "r+b" if write_mode else "rb"
+    self.rom_file = open(rom_filename, self.mode_string)
+    self.level_headers = None  # type: Optional[List[LevelHeader]]
+
+  # Closes and reopens the ROM file so that subsequent reads see any changes
+  # saved to disk by an external editor (including editors that save by
+  # replacing the file rather than rewriting it in place).
+  def Reload(self) -> None:
+    self.rom_file.close()
+    self.rom_file = open(self.rom_filename, self.mode_string)
+    self.level_headers = None
 
   # Reads one or more bytes from the NES ROM file
   #
@@ -60,6 +71,8 @@ class ZeldaRom(object):
       self.rom_file.seek((address + self.NES_HEADER_OFFSET) + offset)
       self.rom_file.write(bytes([byte]))
       offset = offset + 1
+    # The write may have landed in data that's been parsed and cached.
+    self.level_headers = None
 
   # Gets map data from the rom
   #
@@ -79,15 +92,18 @@ class ZeldaRom(object):
       data.append(byte)
     return data
 
-  def _GetEncodedMapData(self, room_num: int, is_overworld: bool=False, is7to9: bool = False) -> List[int]:
-    data = []  # type: List[int]
+  def _GetEncodedDataStartLocation(self, is_overworld: bool=False, is7to9: bool = False) -> int:
     offset_overworld = self._ReadMemory(self.OVERWORLD_POINTER_OFFSET_LOCATION, 1)[0]
     offset_1to6 = self._ReadMemory(self.LEVEL_1_6_POINTER_OFFSET_LOCATION, 1)[0]
     offset_7to9 = self._ReadMemory(self.LEVEL_7_9_POINTER_OFFSET_LOCATION, 1)[0]
 
     maybe_offset = offset_7to9 if is7to9 else offset_1to6
     offset = offset_overworld if is_overworld else maybe_offset
-    start_location = self.DATA_START_LOCATION + offset
+    return self.DATA_START_LOCATION + offset
+
+  def _GetEncodedMapData(self, room_num: int, is_overworld: bool=False, is7to9: bool = False) -> List[int]:
+    data = []  # type: List[int]
+    start_location = self._GetEncodedDataStartLocation(is_overworld=is_overworld, is7to9=is7to9)
 
     for table_num in range(0, 6):
       byte_1 = self._ReadMemory(start_location + (5 * (0x80 * table_num + room_num)), 1)[0]
@@ -100,6 +116,59 @@ class ZeldaRom(object):
       return LevelRoom(self._GetEncodedMapData(room_num, is_overworld=is_overworld, is7to9=is7to9))
     return LevelRoom(self._GetRawMapData(room_num, is_overworld=is_overworld, is7to9=is7to9))
 
+  # Gets all six room tables for a group of levels as one block of bytes.
+  #
+  # Args:
+  #   is7to9: True if accessing data for levels 7-9, False for levels 1-6
+  #   decode_mode: True to read the encoded tables used by GetLevelRoom's
+  #     decode_mode instead of the raw ones
+  # Returns:
+  #   The bytes that GetLevelRoom reads for every room in the group (List[int])
+  def GetLevelRoomTableData(self, is7to9: bool = False, decode_mode: bool = False) -> List[int]:
+    if decode_mode:
+      start_location = self._GetEncodedDataStartLocation(is7to9=is7to9)
+      return self._ReadMemory(start_location, 5 * 0x80 * 6)
+    start_location = self.LEVEL_1_6_DATA_LOCATION
+    if is7to9:
+      start_location = start_location + self.LEVEL_DATA_OFFSET
+    return self._ReadMemory(start_location, 0x80 * 6)
+
+  # Gets the full block of special data (start room, stairway list, etc.) for
+  # a level.
+  #
+  # Args:
+  #   level_num: The number of the level to get info for (int)
+  # Returns:
+  #   SPECIAL_LEVEL_DATA_OFFSET bytes of special level data (List[int])
+  def GetSpecialLevelData(self, level_num: int) -> List[int]:
+    return list(self.GetLevelHeader(level_num).GetData())
+
+  # Parses the special data for all nine levels.
+  #
+  # All 9 * SPECIAL_LEVEL_DATA_OFFSET bytes are read with a single file read
+  # and split into per-level records.  The result is cached, so the ROM is
+  # only read the first time this is called (or the first time after Reload()
+  # or WriteBytes()).
+  #
+  # Returns:
+  #   One LevelHeader per level, zero-indexed (List[LevelHeader])
+  # Raises:
+  #   ValueError: If the ROM file is too short to hold all nine records
+  def GetLevelHeaders(self) -> List[LevelHeader]:
+    if self.level_headers is None:
+      self.rom_file.seek(self.NES_HEADER_OFFSET + self.LEVEL_ONE_START_ROOM_LOCATION)
+      raw_data = memoryview(self.rom_file.read(9 * self.SPECIAL_LEVEL_DATA_OFFSET))
+      self.level_headers = [
+          LevelHeader(level_num, raw_data[self.SPECIAL_LEVEL_DATA_OFFSET * level_num:
+                                          self.SPECIAL_LEVEL_DATA_OFFSET * (level_num + 1)])
+          for level_num in range(0, 9)
+      ]
+    return self.level_headers
+
+  def GetLevelHeader(self, level_num: int) -> LevelHeader:
+    assert level_num in range(0, 9)
+    return self.GetLevelHeaders()[level_num]
+
   def WriteRoomItemCode(self, room_num: int, is7to9: bool, item_code: int) -> None:
     address = self.LEVEL_1_6_DATA_LOCATION + 0x80 * 4 + room_num
     if is7to9:
@@ -116,12 +185,7 @@ class ZeldaRom(object):
   # Returns:
   #   The coordinates of the start room, e.g. 0x7F (int)
   def GetLevelStartRoomNumber(self, level_num: int) -> int:
-    assert level_num in range(0, 9)
-    # Each level contains 0xFC bytes of special data before the next one starts.
-    location = (self.LEVEL_ONE_START_ROOM_LOCATION + self.SPECIAL_LEVEL_DATA_OFFSET * (level_num))
-    raw_value = self._ReadMemory(location, 1)[0]
-    # return self._ToInt(raw_value)
-    return raw_value
+    return self.GetLevelHeader(level_num).GetStartRoomNumber()
 
   # Gets a list of stairway rooms for a level.
   #
@@ -129,30 +193,14 @@ class ZeldaRom(object):
   # dungeon rooms but also item rooms with only one passage two and
   # from a dungeon room.
   #
+  # The last byte of the list is the level's entrance direction code (see
+  # LevelHeader), and the list includes LevelHeader's workaround for vanilla
+  # level 3.
+  #
   # Args:
   #  level_num: The level to get information for (int)
   # Returns:
   #  Zero or more bytes containing the stairway room numbers
   def GetLevelStairwayRoomNumberList(self,
                                      level_num: int) -> List[int]:
-    assert level_num in range(0, 9)
-    stairway_list_location = (self.LEVEL_ONE_START_ROOM_LOCATION + self.SPECIAL_LEVEL_DATA_OFFSET *
-                              (level_num) + self.START_ROOM_STAIRWAY_ROOM_OFSET)
-    assert level_num in range(0, 9)
-    raw_bytes = self._ReadMemory(stairway_list_location, 10)
-    stairway_list = []  # type: List[int]
-    for byte in raw_bytes:
-      if not byte == 0xFF:
-        stairway_list.append(byte)
-
-    # This is a hack needed in order to make vanilla L3 work.  For some reason,
-    # the vanilla ROM's data for level 3 doesn't include a stairway room even
-    # though there obviously is one in vanilla level 3.
-    #
-    # See http://www.romhacking.net/forum/index.php?topic=18750.msg271821#msg271821
-    # for more information about why this is the case and why this hack
-    # is needed.
-    if level_num == 2 and not stairway_list:
-      stairway_list.append(0x0F)
-
-    return stairway_list
+    return self.GetLevelHeader(level_num).GetStairwayList()